@@ -3,17 +3,23 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import Body, FastAPI
+from fastapi.responses import Response
 
 app = FastAPI(title="Autoppia Web Agent Template API")
 
+# The template answer never changes, so encode it once instead of per request.
+# A fresh Response wraps it each call: FastAPI mutates the returned object
+# (e.g. attaches BackgroundTasks), so it must not be shared between requests.
+_EMPTY_ACTIONS_BODY = b'{"actions":[]}'
+
 
 @app.get("/health", summary="Health check")
 async def health() -> dict[str, str]:
     return {"status": "healthy"}
 
 
-@app.post("/act", summary="Template action endpoint")
-async def act(payload: dict[str, Any] = Body(...)) -> dict[str, list[dict[str, Any]]]:
+@app.post("/act", summary="Template action endpoint", response_model=dict[str, list[dict[str, Any]]])
+async def act(payload: dict[str, Any] = Body(...)) -> Response:
     """Template endpoint for miners.
 
     Expected payload shape (simplified):
@@ -28,9 +34,14 @@ async def act(payload: dict[str, Any] = Body(...)) -> dict[str, list[dict[str, A
     an empty action list so miners can copy the server contract first.
     """
     _ = payload
-    return {"actions": []}
+    return Response(content=_EMPTY_ACTIONS_BODY, media_type="application/json")
 
 
-@app.post("/step", summary="Alias for /act")
-async def step(payload: dict[str, Any] = Body(...)) -> dict[str, list[dict[str, Any]]]:
-    return await act(payload)
+# Register the same handler for /step instead of wrapping it in a second coroutine.
+app.add_api_route(
+    "/step",
+    act,
+    methods=["POST"],
+    summary="Alias for /act",
+    response_model=dict[str, list[dict[str, Any]]],
+)
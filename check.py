@@ -178,8 +178,15 @@ def _call_act(app) -> dict[str, Any] | None:
             if inspect.iscoroutinefunction(endpoint):
                 import asyncio
 
-                return asyncio.run(endpoint(payload))  # type: ignore[arg-type]
-            return endpoint(payload)  # type: ignore[arg-type]
+                resp = asyncio.run(endpoint(payload))  # type: ignore[arg-type]
+            else:
+                resp = endpoint(payload)  # type: ignore[arg-type]
+
+            # Endpoints may return a prebuilt Starlette Response; check its JSON body.
+            body = getattr(resp, "body", None)
+            if isinstance(body, (bytes, bytearray)):
+                return json.loads(body)
+            return resp
 
     return None
 
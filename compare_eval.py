@@ -4,18 +4,35 @@ from __future__ import annotations
 """Run eval.py multiple times and aggregate summaries.
 
 This is a generic utility for miners comparing configs/models.
-The run key format is `provider:model` and is passed via env vars:
+The run key format is `provider:model`. By default all runs execute in this
+process and share one HTTP connection pool. With `--isolate`, each run is a
+separate `eval.py` subprocess and the key is passed via env vars:
 - LLM_PROVIDER
 - OPENAI_MODEL
 """
 
 import argparse
-import json
+import asyncio
 import os
 import re
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from eval import (
+    RESULT_FORMATS,
+    _load_tasks,
+    dumps_json,
+    loads_json,
+    print_summary,
+    run_async,
+    run_eval,
+    summary_path,
+    write_result,
+)
 
 
 REPO_DIR = Path(__file__).resolve().parent
@@ -43,14 +60,129 @@ def _parse_run(raw: str) -> RunSpec:
     return RunSpec(provider=provider, model=model)
 
 
+def _summary_row(spec: RunSpec, s: dict[str, Any], run_out: Path) -> dict[str, Any]:
+    return {
+        "provider": spec.provider,
+        "model": spec.model,
+        "ok_calls": int(s.get("ok_calls") or 0),
+        "total_calls": int(s.get("total_calls") or 0),
+        "ok_rate": float(s.get("ok_rate") or 0.0),
+        "avg_latency_ms": float(s.get("avg_latency_ms") or 0.0),
+        "out": str(run_out),
+    }
+
+
+def _run_isolated(spec: RunSpec, args: argparse.Namespace, run_out: Path, base_env: dict[str, str]) -> dict[str, Any]:
+    env = {**base_env, "LLM_PROVIDER": spec.provider, "OPENAI_MODEL": spec.model}
+
+    cmd = [
+        env.get("PYTHON", "python"),
+        str(REPO_DIR / "eval.py"),
+        "--agent-base-url",
+        str(args.agent_base_url),
+        "--num-tasks",
+        str(int(args.num_tasks)),
+        "--repeat",
+        str(int(args.repeat)),
+        "--timeout-seconds",
+        str(float(args.timeout_seconds)),
+        "--max-concurrency",
+        str(int(args.max_concurrency)),
+        "--out",
+        str(run_out),
+        "--format",
+        str(args.format),
+    ]
+    if args.fast_empty:
+        cmd.append("--fast-empty")
+    if args.tasks_file:
+        cmd.extend(["--tasks-file", str(args.tasks_file)])
+    if args.max_tasks is not None:
+        cmd.extend(["--max-tasks", str(int(args.max_tasks))])
+
+    proc = subprocess.run(cmd, cwd=str(REPO_DIR), env=env, check=False)
+    if proc.returncode != 0:
+        raise SystemExit(proc.returncode)
+
+    # Read only the small summary file, not the full episode dump.
+    return loads_json(summary_path(run_out).read_bytes()) or {}
+
+
+async def _run_one(
+    spec: RunSpec,
+    args: argparse.Namespace,
+    out_dir: Path,
+    tasks: list[dict[str, Any]],
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+) -> dict[str, Any]:
+    run_out = out_dir / f"{spec.slug}.json"
+    async with sem:
+        result = await run_eval(
+            agent_base_url=str(args.agent_base_url),
+            tasks=tasks,
+            repeat=int(args.repeat),
+            timeout_seconds=float(args.timeout_seconds),
+            max_concurrency=int(args.max_concurrency),
+            fast_empty=bool(args.fast_empty),
+            session=session,
+            provider=spec.provider,
+            model=spec.model,
+        )
+    write_result(run_out, result, args.format)
+    print(f"\n=== RUN {spec.provider}:{spec.model} ===")
+    print_summary(result["summary"], run_out)
+    return _summary_row(spec, result["summary"], run_out)
+
+
+async def _compare_all(run_specs: list[RunSpec], args: argparse.Namespace, out_dir: Path) -> list[dict[str, Any]]:
+    tasks = _load_tasks(args.tasks_file, args.num_tasks, args.max_tasks)
+    parallel = max(1, int(args.parallel))
+    sem = asyncio.Semaphore(parallel)
+
+    # All runs hit the same agent, so size the per-host pool for every in-flight request.
+    per_host = parallel * max(1, int(args.max_concurrency))
+    timeout = aiohttp.ClientTimeout(total=float(args.timeout_seconds))
+    connector = aiohttp.TCPConnector(limit=max(100, per_host), limit_per_host=per_host, keepalive_timeout=30)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        return list(await asyncio.gather(*(_run_one(spec, args, out_dir, tasks, session, sem) for spec in run_specs)))
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Compare eval runs across provider:model configs")
     ap.add_argument("--runs", nargs="+", action="append", required=True, help="provider:model entries")
     ap.add_argument("--agent-base-url", default="http://127.0.0.1:5000")
     ap.add_argument("--tasks-file", default=None)
     ap.add_argument("--num-tasks", type=int, default=5)
+    ap.add_argument("--max-tasks", type=int, default=None, help="Optional cap on tasks read from --tasks-file")
     ap.add_argument("--repeat", type=int, default=1)
     ap.add_argument("--timeout-seconds", type=float, default=30.0)
+    ap.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Max in-flight /act calls per run; lowered automatically on overload. Latencies are measured at this load",
+    )
+    ap.add_argument(
+        "--fast-empty",
+        action="store_true",
+        help="Recognize a literal {\"actions\": []} body by byte pattern instead of parsing it",
+    )
+    ap.add_argument("--format", choices=RESULT_FORMATS, default="json", help="Per-run result format (see eval.py)")
+    ap.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help=(
+            "Max configs evaluated at the same time (in-process only). Values > 1 make runs share the agent, "
+            "so their latencies are not comparable with serial or --isolate runs"
+        ),
+    )
+    ap.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each config in a separate eval.py subprocess with LLM_PROVIDER/OPENAI_MODEL env vars",
+    )
     args = ap.parse_args()
 
     run_specs: list[RunSpec] = []
@@ -61,54 +193,20 @@ def main() -> None:
     out_dir = REPO_DIR / "data" / "compare"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    summary_rows: list[dict] = []
-
-    for spec in run_specs:
-        run_out = out_dir / f"{spec.slug}.json"
-        env = os.environ.copy()
-        env["LLM_PROVIDER"] = spec.provider
-        env["OPENAI_MODEL"] = spec.model
-
-        cmd = [
-            env.get("PYTHON", "python"),
-            str(REPO_DIR / "eval.py"),
-            "--agent-base-url",
-            str(args.agent_base_url),
-            "--num-tasks",
-            str(int(args.num_tasks)),
-            "--repeat",
-            str(int(args.repeat)),
-            "--timeout-seconds",
-            str(float(args.timeout_seconds)),
-            "--out",
-            str(run_out),
-        ]
-        if args.tasks_file:
-            cmd.extend(["--tasks-file", str(args.tasks_file)])
-
-        print(f"\n=== RUN {spec.provider}:{spec.model} ===")
-        proc = subprocess.run(cmd, cwd=str(REPO_DIR), env=env, check=False)
-        if proc.returncode != 0:
-            raise SystemExit(proc.returncode)
-
-        payload = json.loads(run_out.read_text(encoding="utf-8"))
-        s = payload.get("summary") or {}
-        summary_rows.append(
-            {
-                "provider": spec.provider,
-                "model": spec.model,
-                "ok_calls": int(s.get("ok_calls") or 0),
-                "total_calls": int(s.get("total_calls") or 0),
-                "ok_rate": float(s.get("ok_rate") or 0.0),
-                "avg_latency_ms": float(s.get("avg_latency_ms") or 0.0),
-                "out": str(run_out),
-            }
-        )
+    if args.isolate:
+        base_env = os.environ.copy()
+        summary_rows: list[dict] = []
+        for spec in run_specs:
+            run_out = out_dir / f"{spec.slug}.json"
+            print(f"\n=== RUN {spec.provider}:{spec.model} ===")
+            summary_rows.append(_summary_row(spec, _run_isolated(spec, args, run_out, base_env), run_out))
+    else:
+        summary_rows = run_async(_compare_all(run_specs, args, out_dir))
 
     summary_rows.sort(key=lambda r: (-r["ok_rate"], r["avg_latency_ms"]))
     summary = {"runs": summary_rows}
-    summary_path = out_dir / "compare_summary.json"
-    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    compare_path = out_dir / "compare_summary.json"
+    compare_path.write_bytes(dumps_json(summary))
 
     print("\n=== Compare Summary ===")
     for row in summary_rows:
@@ -117,7 +215,7 @@ def main() -> None:
             f"{row['ok_calls']}/{row['total_calls']} ({row['ok_rate']:.1%}) "
             f"avg={row['avg_latency_ms']:.1f}ms"
         )
-    print(f"wrote: {summary_path}")
+    print(f"wrote: {compare_path}")
 
 
 if __name__ == "__main__":
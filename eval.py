@@ -9,16 +9,92 @@ It validates endpoint availability, response shape, and timing.
 
 import argparse
 import asyncio
+import collections
+import contextlib
+import dataclasses
+import gzip
+import itertools
 import json
+import os
+import re
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Coroutine, Iterator, TypeVar
 
 import aiohttp
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships in requirements.txt
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import uvloop
+except ImportError:  # optional: installed with uvicorn[standard]
+    uvloop = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # optional: only used to stream large tasks files
+    ijson = None  # type: ignore[assignment]
+
 
 REPO_DIR = Path(__file__).resolve().parent
 
+T = TypeVar("T")
+
+# Below this size a full orjson parse is faster than streaming with ijson.
+_STREAM_MIN_BYTES = 256 * 1024
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """`asyncio.run`, on a uvloop event loop when uvloop is installed."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    if not hasattr(asyncio, "Runner"):  # Python < 3.11
+        uvloop.install()
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
+def loads_json(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any, *, indent: bool = True) -> bytes:
+    """Serialize `obj` as JSON bytes, 2-space indented unless `indent=False`."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2) if indent else orjson.dumps(obj)
+    if indent:
+        return json.dumps(obj, indent=2, default=_json_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _json_default(obj: Any) -> Any:
+    # orjson serializes dataclasses natively; the stdlib fallback needs help.
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@dataclasses.dataclass(slots=True)
+class Episode:
+    """Outcome of a single `/act` call within an eval run."""
+
+    repeat_index: int
+    task_index: int
+    task_id: str | None
+    ok: bool = False
+    status: int = 0
+    elapsed_ms: int = 0
+    shape_ok: bool = False
+    shape_msg: str = ""
+    action_count: int = 0
+    error: str | None = None
+
 
 def _default_tasks(num_tasks: int) -> list[dict[str, Any]]:
     tasks: list[dict[str, Any]] = []
@@ -36,22 +112,53 @@ def _default_tasks(num_tasks: int) -> list[dict[str, Any]]:
     return tasks
 
 
-def _load_tasks(path: str | None, fallback_num_tasks: int) -> list[dict[str, Any]]:
-    if not path:
-        return _default_tasks(fallback_num_tasks)
+def _iter_task_items(p: Path) -> Iterator[Any]:
+    if ijson is None or p.stat().st_size < _STREAM_MIN_BYTES:
+        raw = loads_json(p.read_bytes())
+        if isinstance(raw, dict) and isinstance(raw.get("tasks"), list):
+            yield from raw["tasks"]
+        elif isinstance(raw, list):
+            yield from raw
+        else:
+            raise ValueError("tasks file must be a JSON list or {'tasks':[...]} object")
+        return
+
+    with p.open("rb") as f:
+        # The parser skips any leading whitespace; its first event tells us the top-level type.
+        events = ijson.parse(f, use_float=True)
+        first = next(events, None)
+        if first is not None and first[1] == "start_array":
+            yield from ijson.items(itertools.chain([first], events), "item", use_float=True)
+            return
+        if first is None or first[1] != "start_map":
+            raise ValueError("tasks file must be a JSON list or {'tasks':[...]} object")
+
+        found_tasks = False
+
+        def _watch() -> Iterator[tuple[str, str, Any]]:
+            nonlocal found_tasks
+            yield first
+            for event in events:
+                yield event
+                if event[0] == "tasks" and event[1] == "start_array":
+                    found_tasks = True
+                    yield from events
+                    return
+
+        yield from ijson.items(_watch(), "tasks.item", use_float=True)
+        if not found_tasks:
+            raise ValueError("tasks file must be a JSON list or {'tasks':[...]} object")
 
-    p = Path(path)
-    raw = json.loads(p.read_text(encoding="utf-8"))
 
-    if isinstance(raw, dict) and isinstance(raw.get("tasks"), list):
-        data = raw["tasks"]
-    elif isinstance(raw, list):
-        data = raw
-    else:
-        raise ValueError("tasks file must be a JSON list or {'tasks':[...]} object")
+def _load_tasks(path: str | None, fallback_num_tasks: int, max_tasks: int | None = None) -> list[dict[str, Any]]:
+    if not path:
+        return _default_tasks(fallback_num_tasks)
 
     tasks: list[dict[str, Any]] = []
-    for i, item in enumerate(data):
+    if max_tasks is not None and max_tasks <= 0:
+        return tasks
+
+    for i, item in enumerate(_iter_task_items(Path(path))):
         if not isinstance(item, dict):
             continue
         tasks.append(
@@ -64,6 +171,8 @@ def _load_tasks(path: str | None, fallback_num_tasks: int) -> list[dict[str, Any
                 "history": item.get("history") if isinstance(item.get("history"), list) else [],
             }
         )
+        if max_tasks is not None and len(tasks) >= max_tasks:
+            break
     return tasks
 
 
@@ -71,26 +180,116 @@ def _validate_actions_shape(payload: Any) -> tuple[bool, str]:
     if not isinstance(payload, dict):
         return False, f"response is not an object ({type(payload).__name__})"
     actions = payload.get("actions")
+    # Fast path: the template server always answers {"actions": []}.
+    if actions == []:
+        return True, "ok"
     if not isinstance(actions, list):
         return False, "missing or invalid 'actions' list"
-    for idx, action in enumerate(actions):
-        if not isinstance(action, dict):
-            return False, f"actions[{idx}] is not an object"
-        t = action.get("type")
-        if t is not None and not isinstance(t, str):
-            return False, f"actions[{idx}].type must be a string when present"
+    bad = next(
+        (
+            i
+            for i, a in enumerate(actions)
+            if not isinstance(a, dict) or (a.get("type") is not None and not isinstance(a["type"], str))
+        ),
+        -1,
+    )
+    if bad >= 0:
+        if not isinstance(actions[bad], dict):
+            return False, f"actions[{bad}] is not an object"
+        return False, f"actions[{bad}].type must be a string when present"
     return True, "ok"
 
 
+# Statuses that mean "slow down" rather than "the agent is broken".
+_OVERLOAD_STATUSES = frozenset({429, 503})
+_OVERLOAD_RETRIES = 3
+_OVERLOAD_BACKOFF_SECONDS = 0.1
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Matches the template's `{"actions": []}` reply (any whitespace) without parsing JSON.
+_EMPTY_ACTIONS_RE = re.compile(rb'^\s*\{\s*"actions"\s*:\s*\[\s*\]\s*\}\s*$')
+
+
+class ServiceOverloadError(Exception):
+    def __init__(self, status: int) -> None:
+        super().__init__(f"agent overloaded (HTTP {status})")
+        self.status = status
+
+
+class _AdaptiveLimiter:
+    """AIMD concurrency limit, in the spirit of TCP congestion control.
+
+    Every success grows the limit by 1/limit (about +1 per full window) up to
+    `max_limit`; an overload signal multiplies it by `decrease_factor`. Only
+    one decrease is applied per window: calls started before the last
+    decrease do not shrink the limit again.
+    """
+
+    def __init__(self, max_limit: int, initial: int | None = None, decrease_factor: float = 0.5) -> None:
+        self.max_limit = max(1, int(max_limit))
+        self.limit = float(min(self.max_limit, max(1, int(initial or self.max_limit))))
+        self.decrease_factor = float(decrease_factor)
+        self._in_flight = 0
+        self._epoch = 0
+        # FIFO of callers waiting for a slot. Slots are handed over directly by
+        # _wake(), so a release only resumes as many waiters as it frees.
+        self._waiters: collections.deque[asyncio.Future[None]] = collections.deque()
+
+    async def acquire(self) -> int:
+        if not self._waiters and self._in_flight < int(self.limit):
+            self._in_flight += 1
+            return self._epoch
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # A slot was handed to us just before cancellation; pass it on.
+                self._in_flight -= 1
+                self._wake()
+            raise
+        return self._epoch
+
+    def release(self, epoch: int, *, overloaded: bool) -> None:
+        self._in_flight -= 1
+        if overloaded:
+            if epoch == self._epoch:
+                self.limit = max(1.0, self.limit * self.decrease_factor)
+                self._epoch += 1
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < int(self.limit):
+            fut = self._waiters.popleft()
+            if fut.done():  # cancelled while waiting
+                continue
+            self._in_flight += 1
+            fut.set_result(None)
+
+
 async def _call_act(
     session: aiohttp.ClientSession,
     *,
     base_url: str,
-    payload: dict[str, Any],
+    payload: bytes,
+    timeout: aiohttp.ClientTimeout | None = None,
+    fast_empty: bool = False,
 ) -> dict[str, Any]:
     started = time.perf_counter()
-    async with session.post(f"{base_url.rstrip('/')}/act", json=payload) as resp:
-        body = await resp.json(content_type=None)
+    async with session.post(
+        f"{base_url.rstrip('/')}/act", data=payload, headers=_JSON_HEADERS, timeout=timeout
+    ) as resp:
+        if resp.status in _OVERLOAD_STATUSES:
+            raise ServiceOverloadError(int(resp.status))
+        raw = await resp.read()
+        if fast_empty and _EMPTY_ACTIONS_RE.match(raw):
+            body: Any = {"actions": []}
+        else:
+            body = loads_json(raw) if raw.strip() else None
         elapsed_ms = int((time.perf_counter() - started) * 1000)
         return {
             "status": int(resp.status),
@@ -99,46 +298,147 @@ async def _call_act(
         }
 
 
+async def _warm_up(
+    session: aiohttp.ClientSession,
+    *,
+    base_url: str,
+    connections: int = 1,
+    timeout: aiohttp.ClientTimeout | None = None,
+) -> int | None:
+    """Open `connections` pooled connections via concurrent `GET /health` calls.
+
+    Sized to the first wave of `/act` calls so none of them pays for
+    connection setup. Returns the slowest successful warm-up in ms, or None
+    if every request failed.
+    """
+    url = f"{base_url.rstrip('/')}/health"
+
+    async def _get() -> int | None:
+        started = time.perf_counter()
+        try:
+            async with session.get(url, timeout=timeout) as resp:
+                await resp.read()
+        except Exception:
+            return None
+        return int((time.perf_counter() - started) * 1000)
+
+    timings = [t for t in await asyncio.gather(*(_get() for _ in range(max(1, connections)))) if t is not None]
+    return max(timings) if timings else None
+
+
+async def _call_act_adaptive(
+    session: aiohttp.ClientSession,
+    limiter: _AdaptiveLimiter,
+    *,
+    base_url: str,
+    payload: bytes,
+    timeout: aiohttp.ClientTimeout | None = None,
+    fast_empty: bool = False,
+) -> dict[str, Any]:
+    """`_call_act` gated by `limiter`, retrying HTTP 429/503 with backoff."""
+    attempt = 0
+    while True:
+        epoch = await limiter.acquire()
+        overloaded = False
+        try:
+            return await _call_act(
+                session, base_url=base_url, payload=payload, timeout=timeout, fast_empty=fast_empty
+            )
+        except (ServiceOverloadError, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            overloaded = True
+            if not isinstance(exc, ServiceOverloadError) or attempt >= _OVERLOAD_RETRIES:
+                raise
+        finally:
+            limiter.release(epoch, overloaded=overloaded)
+        attempt += 1
+        await asyncio.sleep(_OVERLOAD_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+
 async def run_eval(
     *,
     agent_base_url: str,
     tasks: list[dict[str, Any]],
     repeat: int,
     timeout_seconds: float,
+    max_concurrency: int = 16,
+    fast_empty: bool = False,
+    session: aiohttp.ClientSession | None = None,
+    provider: str | None = None,
+    model: str | None = None,
 ) -> dict[str, Any]:
-    episodes: list[dict[str, Any]] = []
+    """Call `/act` for every task `repeat` times and summarize the results.
 
+    Calls run concurrently under an adaptive limit that starts at
+    `max_concurrency`, halves on HTTP 429/503, timeouts and connection errors
+    and climbs back towards the cap while the agent keeps up. It does not
+    react to latency, so `avg_latency_ms` is measured under whatever
+    concurrency the limiter settles at (`final_concurrency`). With `fast_empty`, a literal
+    `{"actions": []}` body is recognized without JSON parsing. Before timing,
+    one `GET /health` per initial concurrency slot opens the connection pool,
+    so connection setup is reported as `warmup_ms` rather than skewing `/act`
+    latencies.
+
+    Pass `session` to reuse an existing connection pool (e.g. across several
+    runs in `compare_eval.py`); otherwise a session is created for this run.
+    `provider`/`model` are only recorded in the result for comparison.
+    """
     timeout = aiohttp.ClientTimeout(total=float(timeout_seconds))
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        for r in range(max(1, int(repeat))):
-            for idx, task in enumerate(tasks):
-                result: dict[str, Any] = {
-                    "repeat_index": r,
-                    "task_index": idx,
-                    "task_id": task.get("task_id"),
-                    "ok": False,
-                }
-                try:
-                    call = await _call_act(session, base_url=agent_base_url, payload=task)
-                    result["status"] = call["status"]
-                    result["elapsed_ms"] = call["elapsed_ms"]
-
-                    shape_ok, shape_msg = _validate_actions_shape(call["body"])
-                    result["shape_ok"] = shape_ok
-                    result["shape_msg"] = shape_msg
-
-                    actions = call["body"].get("actions") if isinstance(call["body"], dict) else []
-                    result["action_count"] = len(actions) if isinstance(actions, list) else 0
-                    result["ok"] = (int(call["status"]) == 200) and bool(shape_ok)
-                except Exception as exc:
-                    result["error"] = str(exc)
-                episodes.append(result)
-
-    ok_count = sum(1 for ep in episodes if ep.get("ok"))
-    avg_latency = (sum(int(ep.get("elapsed_ms") or 0) for ep in episodes) / len(episodes)) if episodes else 0.0
+    max_concurrency = max(1, int(max_concurrency))
+    limiter = _AdaptiveLimiter(max_concurrency)
+
+    # Serialize each task once; repeats reuse the same request body.
+    payloads = [dumps_json(task, indent=False) for task in tasks]
+
+    async def _one(session: aiohttp.ClientSession, r: int, idx: int, task: dict[str, Any]) -> Episode:
+        ep = Episode(repeat_index=r, task_index=idx, task_id=task.get("task_id"))
+        try:
+            call = await _call_act_adaptive(
+                session,
+                limiter,
+                base_url=agent_base_url,
+                payload=payloads[idx],
+                timeout=timeout,
+                fast_empty=fast_empty,
+            )
+            ep.status = call["status"]
+            ep.elapsed_ms = call["elapsed_ms"]
+            ep.shape_ok, ep.shape_msg = _validate_actions_shape(call["body"])
+
+            actions = call["body"].get("actions") if isinstance(call["body"], dict) else []
+            ep.action_count = len(actions) if isinstance(actions, list) else 0
+            ep.ok = (int(call["status"]) == 200) and bool(ep.shape_ok)
+        except ServiceOverloadError as exc:
+            ep.status = exc.status
+            ep.error = str(exc)
+        except Exception as exc:
+            ep.error = str(exc)
+        return ep
+
+    pairs = [(r, idx, task) for r in range(max(1, int(repeat))) for idx, task in enumerate(tasks)]
+    async with contextlib.AsyncExitStack() as stack:
+        if session is None:
+            session = await stack.enter_async_context(aiohttp.ClientSession(timeout=timeout))
+        warmup_ms = await _warm_up(
+            session,
+            base_url=agent_base_url,
+            connections=min(int(limiter.limit), len(pairs)),
+            timeout=timeout,
+        )
+        # gather() preserves input order, so episodes stay sorted by (repeat, task).
+        episodes: list[Episode] = list(await asyncio.gather(*(_one(session, *p) for p in pairs)))
+
+    ok_count = 0
+    latency_sum = 0
+    for ep in episodes:
+        if ep.ok:
+            ok_count += 1
+        latency_sum += ep.elapsed_ms
+    avg_latency = (latency_sum / len(episodes)) if episodes else 0.0
 
     return {
         "agent_base_url": agent_base_url,
+        "provider": provider,
+        "model": model,
         "num_tasks": len(tasks),
         "repeat": int(repeat),
         "episodes": episodes,
@@ -147,40 +447,99 @@ async def run_eval(
             "ok_calls": ok_count,
             "ok_rate": (ok_count / len(episodes)) if episodes else 0.0,
             "avg_latency_ms": round(avg_latency, 2),
+            "final_concurrency": int(limiter.limit),
+            "warmup_ms": warmup_ms,
         },
     }
 
 
+RESULT_FORMATS = ("json", "jsonl-gz")
+
+
+def summary_path(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.stem}.summary.json")
+
+
+def write_result(out_path: Path, result: dict[str, Any], fmt: str = "json") -> None:
+    """Write an eval result to `out_path`.
+
+    With `fmt="jsonl-gz"`, `out_path` only gets the metadata and summary;
+    episodes are streamed one per line to `<stem>.episodes.jsonl.gz` next to it.
+    The summary alone is always written to `summary_path(out_path)` as well.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path(out_path).write_bytes(dumps_json(result["summary"]))
+    if fmt == "json":
+        out_path.write_bytes(dumps_json(result))
+        return
+    if fmt != "jsonl-gz":
+        raise ValueError(f"unknown result format: {fmt!r}")
+
+    episodes_path = out_path.with_name(f"{out_path.stem}.episodes.jsonl.gz")
+    with gzip.open(episodes_path, "wb") as f:
+        for ep in result["episodes"]:
+            f.write(dumps_json(ep, indent=False) + b"\n")
+
+    meta = {k: v for k, v in result.items() if k != "episodes"}
+    meta["episodes_path"] = str(episodes_path)
+    out_path.write_bytes(dumps_json(meta))
+
+
+def print_summary(summary: dict[str, Any], out_path: Path) -> None:
+    print("=== Eval Summary ===")
+    print(f"calls:      {summary['ok_calls']}/{summary['total_calls']} ok")
+    print(f"ok_rate:    {summary['ok_rate']:.1%}")
+    print(f"avg_latency:{summary['avg_latency_ms']} ms")
+    if summary.get("warmup_ms") is not None:
+        print(f"warmup:     {summary['warmup_ms']} ms")
+    print(f"out:        {out_path}")
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Generic /act evaluator for miner templates")
     ap.add_argument("--agent-base-url", default="http://127.0.0.1:5000")
     ap.add_argument("--tasks-file", default=None, help="Optional JSON file: list[...] or {'tasks':[...]} ")
     ap.add_argument("--num-tasks", type=int, default=5)
+    ap.add_argument("--max-tasks", type=int, default=None, help="Optional cap on tasks read from --tasks-file")
     ap.add_argument("--repeat", type=int, default=1)
     ap.add_argument("--timeout-seconds", type=float, default=30.0)
+    ap.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Max in-flight /act calls; lowered automatically on overload. Latencies are measured at this load",
+    )
+    ap.add_argument(
+        "--fast-empty",
+        action="store_true",
+        help="Recognize a literal {\"actions\": []} body by byte pattern instead of parsing it",
+    )
     ap.add_argument("--out", default=str(REPO_DIR / "data" / "eval_result.json"))
+    ap.add_argument(
+        "--format",
+        choices=RESULT_FORMATS,
+        default="json",
+        help="json: one file with all episodes; jsonl-gz: summary in --out, episodes in gzipped JSON Lines",
+    )
     args = ap.parse_args()
 
-    tasks = _load_tasks(args.tasks_file, args.num_tasks)
-    result = asyncio.run(
+    tasks = _load_tasks(args.tasks_file, args.num_tasks, args.max_tasks)
+    result = run_async(
         run_eval(
             agent_base_url=str(args.agent_base_url),
             tasks=tasks,
             repeat=int(args.repeat),
             timeout_seconds=float(args.timeout_seconds),
+            max_concurrency=int(args.max_concurrency),
+            fast_empty=bool(args.fast_empty),
+            provider=os.getenv("LLM_PROVIDER") or None,
+            model=os.getenv("OPENAI_MODEL") or None,
         )
     )
 
     out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
-
-    summary = result["summary"]
-    print("=== Eval Summary ===")
-    print(f"calls:      {summary['ok_calls']}/{summary['total_calls']} ok")
-    print(f"ok_rate:    {summary['ok_rate']:.1%}")
-    print(f"avg_latency:{summary['avg_latency_ms']} ms")
-    print(f"out:        {out_path}")
+    write_result(out_path, result, args.format)
+    print_summary(result["summary"], out_path)
 
 
 if __name__ == "__main__":
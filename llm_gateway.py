@@ -2,7 +2,12 @@ from __future__ import annotations
 
 from typing import Any
 
+import asyncio
+import atexit
+import functools
+import importlib.util
 import os
+import threading
 
 import httpx
 
@@ -12,24 +17,59 @@ OPENAI_BASE_URL_ENV = "OPENAI_BASE_URL"
 IWA_TASK_ID_HEADER = "IWA-Task-ID"
 
 
+# Shared client so keep-alive connections are reused across calls. HTTP/2 is
+# enabled only when the optional `h2` package is installed (httpx[http2]).
+_CLIENT: httpx.Client | None = None
+_CLIENT_LOCK = threading.Lock()
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+def _get_client() -> httpx.Client:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = httpx.Client(http2=_HTTP2, timeout=httpx.Timeout(30.0), limits=_LIMITS)
+                atexit.register(_CLIENT.close)
+    return _CLIENT
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """Create a pooled async client (HTTP/2 when available) for `achat_completions`.
+
+    Async clients are tied to the event loop they run on, so callers own and
+    close them (`async with new_async_client() as client: ...`).
+    """
+    return httpx.AsyncClient(http2=_HTTP2, timeout=httpx.Timeout(30.0), limits=_LIMITS)
+
+
+@functools.lru_cache(maxsize=32)
+def _parsed_host(base_url: str) -> str:
+    return (httpx.URL(base_url.strip()).host or "").lower()
+
+
 def is_sandbox_gateway_base_url(base_url: str) -> bool:
     """Return True when base_url looks like the local validator gateway."""
     try:
-        url = httpx.URL((base_url or "").strip())
-        host = (url.host or "").lower()
-        return host in {"sandbox-gateway", "localhost", "127.0.0.1"}
+        return _parsed_host(base_url or "") in {"sandbox-gateway", "localhost", "127.0.0.1"}
     except Exception:
         return False
 
 
+@functools.lru_cache(maxsize=8)
+def _static_headers(api_key: str | None) -> tuple[tuple[str, str], ...]:
+    # Task-independent headers; IWA-Task-ID is added per call.
+    headers: tuple[tuple[str, str], ...] = (("Content-Type", "application/json"),)
+    if api_key:
+        headers += (("Authorization", f"Bearer {api_key}"),)
+    return headers
+
+
 def gateway_headers(*, task_id: str, api_key: str | None = None) -> dict[str, str]:
     """Build OpenAI-compatible headers with mandatory IWA task correlation."""
-    headers: dict[str, str] = {
-        "Content-Type": "application/json",
-        IWA_TASK_ID_HEADER: str(task_id),
-    }
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
+    headers = dict(_static_headers(api_key or None))
+    headers[IWA_TASK_ID_HEADER] = str(task_id)
     return headers
 
 
@@ -46,6 +86,40 @@ def chat_completions(
     This utility is intentionally generic and can be copied into miner projects.
     It does not implement any planning/execution logic.
     """
+    url, headers = _prepare_request(task_id=task_id, base_url=base_url, api_key=api_key)
+    resp = _get_client().post(url, json=body, headers=headers, timeout=float(timeout_seconds))
+    return _parse_response(resp)
+
+
+async def achat_completions(
+    *,
+    client: httpx.AsyncClient,
+    task_id: str,
+    body: dict[str, Any],
+    base_url: str | None = None,
+    api_key: str | None = None,
+    timeout_seconds: float = 30.0,
+) -> dict[str, Any]:
+    """Async variant of `chat_completions` over a caller-owned `client`.
+
+    Create the client once with `new_async_client()` and reuse it across calls
+    so its keep-alive (and HTTP/2) connections are shared.
+    """
+    url, headers = _prepare_request(task_id=task_id, base_url=base_url, api_key=api_key)
+    resp = await client.post(url, json=body, headers=headers, timeout=float(timeout_seconds))
+    return _parse_response(resp)
+
+
+async def chat_completions_many(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Run several `achat_completions` calls concurrently over one client; each item holds its kwargs.
+
+    Results are returned in input order. The first failure is raised.
+    """
+    async with new_async_client() as client:
+        return list(await asyncio.gather(*(achat_completions(**item, client=client) for item in items)))
+
+
+def _prepare_request(*, task_id: str, base_url: str | None, api_key: str | None) -> tuple[str, dict[str, str]]:
     resolved_base_url = (base_url or os.getenv(OPENAI_BASE_URL_ENV, "https://api.openai.com/v1")).rstrip("/")
     resolved_api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY", "")
 
@@ -53,13 +127,13 @@ def chat_completions(
         raise RuntimeError("OPENAI_API_KEY not set and OPENAI_BASE_URL is not a local sandbox gateway")
 
     headers = gateway_headers(task_id=task_id, api_key=resolved_api_key or None)
-    url = f"{resolved_base_url}/chat/completions"
-
-    with httpx.Client(timeout=float(timeout_seconds)) as client:
-        resp = client.post(url, json=body, headers=headers)
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as exc:
-            snippet = (exc.response.text or "")[:300]
-            raise RuntimeError(f"chat/completions failed ({exc.response.status_code}): {snippet}") from exc
-        return resp.json()
+    return f"{resolved_base_url}/chat/completions", headers
+
+
+def _parse_response(resp: httpx.Response) -> dict[str, Any]:
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        snippet = (exc.response.text or "")[:300]
+        raise RuntimeError(f"chat/completions failed ({exc.response.status_code}): {snippet}") from exc
+    return resp.json()
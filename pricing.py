@@ -13,6 +13,8 @@ Notes:
 
 from __future__ import annotations
 
+import functools
+import re
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Tuple
 
@@ -56,13 +58,17 @@ _PRICES: dict[str, ModelPrice] = {
 }
 
 
+# Longest bases first so the alternation prefers e.g. 'gpt-4o-mini' over 'gpt-4o'.
+_SORTED_BASES = sorted(_PRICES, key=len, reverse=True)
+_BASE_RE = re.compile('^(' + '|'.join(re.escape(b) for b in _SORTED_BASES) + ')(?:-|$)')
+
+
+@functools.lru_cache(maxsize=512)
 def _normalize_model(model: str) -> str:
     m = (model or '').strip().lower()
     # Strip snapshot/date suffix if present, keep the base alias we know.
-    for base in sorted(_PRICES.keys(), key=len, reverse=True):
-        if m == base or m.startswith(base + '-'):
-            return base
-    return m
+    match = _BASE_RE.match(m)
+    return match.group(1) if match else m
 
 
 def price_for_model(model: str) -> Optional[ModelPrice]: